@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 import os
 
@@ -8,11 +9,13 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 INVOICES_CSV = PROJECT_ROOT / "data" / "invoices" / "invoices_09_2025.csv"
 CANONICAL_CSV = PROJECT_ROOT / "data" / "refs" / "zabka_food_corner_menu_canonical.csv"
 
-# Neon connection string comes from environment variable NEON_DSN
-NEON_DSN = os.environ.get("NEON_DSN")
-
-if NEON_DSN is None:
-    raise RuntimeError(
-        "Environment variable NEON_DSN is not set. "
-        "Export it in your shell with your Neon connection string."
-    )
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_neon_dsn() -> str:
+    """Neon connection string from the NEON_DSN environment variable (checked on first use)."""
+    dsn = os.environ.get("NEON_DSN")
+    if not dsn:
+        raise RuntimeError(
+            "Environment variable NEON_DSN is not set. "
+            "Export it in your shell with your Neon connection string."
+        )
+    return dsn
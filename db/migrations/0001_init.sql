@@ -1,5 +1,3 @@
-BEGIN;
-
 -- A) Raw invoices (September 2025)
 -- Keep raw column names as-ingested for traceability.
 CREATE TABLE IF NOT EXISTS raw_invoices_09_2025 (
@@ -26,5 +24,3 @@ CREATE TABLE IF NOT EXISTS canonical_menu (
     menu_item      TEXT NOT NULL,
     fc_type        TEXT NOT NULL
 );
-
-COMMIT;
\ No newline at end of file
@@ -1,9 +1,19 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from datetime import datetime, time
 from pathlib import Path
 import yaml
 import re
 
+# Pipeline steps below return a shallow copy of the input: they only replace
+# or add whole columns, so the input's own columns are never reassigned, but
+# every column passed through untouched shares its buffer with the input.
+# Editing a result in place (e.g. `out.loc[0, "qty"] = 99`) can therefore
+# write through to the input; `.copy()` the result first if the input is still
+# needed.
+
 # ---------- Column normalization ----------
 
 ALIASES = {
@@ -53,7 +63,7 @@ ALIASES = {
 
 def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Lowercase, strip, and map Polish headers to normalized English ones."""
-    df = df.copy()
+    df = df.copy(deep=False)
     df.columns = [c.strip().lower() for c in df.columns]
     df.rename(columns={k: v for k, v in ALIASES.items() if k in df.columns}, inplace=True)
     return df
@@ -69,16 +79,24 @@ def is_non_product(name: str) -> bool:
 
 # ---------- Numeric casting ----------
 
+_NUMBER_PAT = r"^[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$"
+
 def _to_number_series(s: pd.Series) -> pd.Series:
     """Robust number parser for PL formats (1 234,56 → 1234.56)."""
     if s.dtype.kind in "biufc":
         return s
-    s = s.astype(str).str.replace(r"\s", "", regex=True)  # remove spaces
-    s = s.str.replace(",", ".", regex=False)              # comma → dot
-    return pd.to_numeric(s, errors="coerce")
+    try:
+        arr = pa.array(s, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        arr = pa.array(s.astype(str), type=pa.string())
+    arr = pc.replace_substring_regex(arr, r"[\s\v\pZ]", "")          # remove spaces (incl. NBSP)
+    arr = pc.replace_substring(arr, ",", ".")                         # comma → dot
+    arr = pc.if_else(pc.match_substring_regex(arr, _NUMBER_PAT), arr, None)  # junk → null
+    out = pc.cast(arr, pa.float64())
+    return pd.Series(out.to_numpy(zero_copy_only=False), index=s.index, name=s.name)
 
 def cast_basic_types(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    df = df.copy(deep=False)
     if "qty" in df.columns:
         df["qty"] = _to_number_series(df["qty"])
     if "unit_price_gross" in df.columns:
@@ -93,40 +111,53 @@ def cast_basic_types(df: pd.DataFrame) -> pd.DataFrame:
 
 def normalize_ean(df: pd.DataFrame) -> pd.DataFrame:
     """Make EAN a clean string while preserving NA."""
-    df = df.copy()
+    df = df.copy(deep=False)
     if "ean" in df.columns:
-        # Convert floats like 5901234567890.0 → "5901234567890"
-        try:
-            df["ean"] = df["ean"].astype("Int64").astype(str)
-        except Exception:
-            df["ean"] = df["ean"].astype(str)
-        df["ean"] = df["ean"].str.replace("<NA>", "", regex=False).str.strip()
+        ean = df["ean"]
+        if ean.dtype == object:
+            # mixed str/int cells: stringify values, keep missing as null
+            ean = ean.where(ean.isna(), ean.astype(str))
+        arr = pa.array(ean, from_pandas=True)
+        if pa.types.is_floating(arr.type):
+            # Convert floats like 5901234567890.0 → 5901234567890
+            arr = pc.cast(pc.floor(arr), pa.int64(), safe=False)
+        arr = pc.utf8_trim_whitespace(pc.cast(arr, pa.string()))
+        df["ean"] = pd.Series(pd.array(arr, dtype="string[pyarrow]"), index=df.index)
     return df
 
 # ---------- Timestamp & slots ----------
 
-def _normalize_time_token(x: str) -> str:
-    """Accept messy time tokens: '8:5', '815', '0815', '123045'."""
-    if ":" in x:
-        return x
-    if not x.isdigit():
-        return x
-    n = len(x)
-    if n <= 2:   # "5" -> "00:05"
-        return f"00:{x.zfill(2)}"
-    if n == 3:   # "815" -> "08:15"
-        return f"0{x[0]}:{x[1:]}"
-    if n == 4:   # "0815" -> "08:15"
-        return f"{x[:2]}:{x[2:]}"
-    if n == 6:   # "123045" -> "12:30:45"
-        return f"{x[:2]}:{x[2:4]}:{x[4:]}"
-    return x
+def _normalize_time_tokens(s: pd.Series) -> pd.Series:
+    """Accept messy time tokens: '8:5', '815', '0815', '123045' (vectorized by length)."""
+    digits = s.str.isdigit() & ~s.str.contains(":", regex=False)
+    n = s.str.len()
+    return pd.Series(np.select(
+        [digits & (n <= 2), digits & (n == 3), digits & (n == 4), digits & (n == 6)],
+        [
+            "00:" + s.str.zfill(2),                                  # "5"      -> "00:05"
+            "0" + s.str[0] + ":" + s.str[1:],                        # "815"    -> "08:15"
+            s.str[:2] + ":" + s.str[2:],                             # "0815"   -> "08:15"
+            s.str[:2] + ":" + s.str[2:4] + ":" + s.str[4:],          # "123045" -> "12:30:45"
+        ],
+        default=s,
+    ), index=s.index)
 
 def _normalize_time_series(s: pd.Series) -> pd.Series:
+    """Parse messy time tokens into time-of-day offsets (timedelta64)."""
     if s is None:
-        return pd.Series(pd.NaT, index=[])
-    s = s.astype(str).str.strip().map(_normalize_time_token)
-    return pd.to_datetime(s, errors="coerce").dt.time
+        return pd.Series(pd.NaT, index=[], dtype="timedelta64[ns]")
+    s = _normalize_time_tokens(s.astype(str).str.strip())
+    # fixed formats first (fast path, also take '8:5'); only leftovers go to "mixed"
+    t = pd.to_datetime(s, errors="coerce", format="%H:%M")
+    for fmt in ("%H:%M:%S", "mixed"):
+        miss = t.isna()
+        if not miss.any():
+            break
+        t[miss] = pd.to_datetime(s[miss], errors="coerce", format=fmt)
+    return t - t.dt.normalize()
+
+# "HH:MM" label for every minute of the day, indexed by minute
+_HOUR_MINUTE = np.array([f"{h:02d}:{m:02d}" for h in range(24) for m in range(60)], dtype=object)
 
 def parse_timestamp(df: pd.DataFrame, tz: str) -> pd.DataFrame:
     """
@@ -136,7 +167,7 @@ def parse_timestamp(df: pd.DataFrame, tz: str) -> pd.DataFrame:
     - Localize to timezone; supports older pandas without errors= kw.
     Also creates df['hour_minute'] ("%H:%M").
     """
-    df = df.copy()
+    df = df.copy(deep=False)
 
     # Date column (must exist after normalize_columns)
     date_ser = pd.to_datetime(df.get("purchase_date"), errors="coerce", dayfirst=True)
@@ -145,16 +176,14 @@ def parse_timestamp(df: pd.DataFrame, tz: str) -> pd.DataFrame:
     if "purchase_time" in df.columns:
         time_ser = _normalize_time_series(df["purchase_time"])
         if len(time_ser) != len(df):
-            time_ser = pd.Series(pd.NaT, index=df.index)
+            time_ser = pd.Series(pd.NaT, index=df.index, dtype="timedelta64[ns]")
     else:
-        time_ser = pd.Series(pd.NaT, index=df.index)
+        time_ser = pd.Series(pd.NaT, index=df.index, dtype="timedelta64[ns]")
 
     # Combine if any time exists, else rely on date only
+    # (midnight of the date + time-of-day offset; NaT if either is missing)
     if time_ser.notna().any():
-        combo = pd.to_datetime(
-            date_ser.dt.strftime("%Y-%m-%d") + " " + pd.Series(time_ser).astype(str),
-            errors="coerce"
-        )
+        combo = date_ser.dt.normalize() + time_ser
     else:
         combo = date_ser
 
@@ -172,34 +201,47 @@ def parse_timestamp(df: pd.DataFrame, tz: str) -> pd.DataFrame:
         pass
 
     df["ts"] = ts
-    df["hour_minute"] = df["ts"].dt.strftime("%H:%M")
+    mm = (ts.dt.hour * 60 + ts.dt.minute).to_numpy()
+    ok = ~np.isnan(mm)
+    df["hour_minute"] = np.where(ok, _HOUR_MINUTE[np.where(ok, mm, 0).astype(int)], np.nan)
     return df
 
 def _to_time(hhmm: str) -> time:
     return datetime.strptime(hhmm, "%H:%M").time()
 
+def _to_minutes(hhmm: str) -> int:
+    t = _to_time(hhmm)
+    return t.hour*60 + t.minute
+
+def _codes(values: list) -> tuple[list, np.ndarray]:
+    """Unique values (first-seen order) and each value's code into them."""
+    cats = list(dict.fromkeys(values))
+    return cats, np.array([cats.index(v) for v in values])
+
 def assign_slots(df: pd.DataFrame, slots_cfg_path: str | Path) -> pd.DataFrame:
-    """Map df['ts'] to slot_id/slot_label using YAML config ranges."""
-    df = df.copy()
+    """Map df['ts'] to slot_id/slot_label using YAML config ranges.
+
+    Slots must not overlap; gaps between them map to NaN. Both columns are
+    categoricals ordered as the slots appear in the config.
+    """
+    df = df.copy(deep=False)
     cfg = yaml.safe_load(Path(slots_cfg_path).read_text(encoding="utf-8"))
-    slots = cfg["slots"]
-
-    mm = df["ts"].dt.hour * 60 + df["ts"].dt.minute
-    slot_ids, slot_labels = [], []
-
-    for m in mm.fillna(-1):
-        sid, lab = None, None
-        if m == -1:
-            slot_ids.append(None); slot_labels.append(None); continue
-        for s in slots:
-            start = _to_time(s["start"]); end = _to_time(s["end"])
-            sm, em = start.hour*60 + start.minute, end.hour*60 + end.minute
-            if sm <= m < em:
-                sid, lab = s["id"], s["label"]; break
-        slot_ids.append(sid); slot_labels.append(lab)
-
-    df["slot_id"] = slot_ids
-    df["slot_label"] = slot_labels
+    id_cats, id_codes = _codes([s["id"] for s in cfg["slots"]])
+    label_cats, label_codes = _codes([s["label"] for s in cfg["slots"]])
+
+    order  = np.argsort([_to_minutes(s["start"]) for s in cfg["slots"]], kind="stable")
+    starts = np.array([_to_minutes(cfg["slots"][i]["start"]) for i in order])
+    ends   = np.array([_to_minutes(cfg["slots"][i]["end"]) for i in order])
+
+    mm = (df["ts"].dt.hour * 60 + df["ts"].dt.minute).fillna(-1).to_numpy()
+
+    # last slot starting at or before each minute, then check it hasn't ended
+    idx = np.searchsorted(starts, mm, side="right") - 1
+    hit = (idx >= 0) & (mm < ends[idx.clip(0)])
+    slot = order[idx.clip(0)]
+
+    df["slot_id"] = pd.Categorical.from_codes(np.where(hit, id_codes[slot], -1), categories=id_cats)
+    df["slot_label"] = pd.Categorical.from_codes(np.where(hit, label_codes[slot], -1), categories=label_cats)
     return df
 
 # ---------- Basic audit summary ----------
@@ -1,23 +1,34 @@
 # src/fc_map_utils.py
+from functools import lru_cache
 from pathlib import Path
+import hashlib
+import io
+import numpy as np
 import pandas as pd
 import re
 from unidecode import unidecode
 from rapidfuzz import process, fuzz
+from src.io_utils import write_parquet
 
 # ------------------ Normalization ------------------
 
+_PL_FOLD = str.maketrans("ąćęłńóśźż", "acelnoszz")
+_NON_ASCII_RE = re.compile(r"[^\x00-\x7f]")
+_CLEAN_RE = re.compile(r"[^a-z0-9\s\-\+]+")
+
 def normalize_text(s: pd.Series | list | pd.Index) -> pd.Series:
     """Lowercase, remove diacritics, keep [a-z0-9 + - space], squeeze spaces."""
     if not isinstance(s, pd.Series):
         s = pd.Series(list(s))
+    out = s.astype(str).str.lower().str.translate(_PL_FOLD)
+    # Polish is folded above; only rows with other non-ASCII chars hit unidecode
+    rest = out.str.contains(_NON_ASCII_RE)
+    if rest.any():
+        out.loc[rest] = out.loc[rest].map(unidecode).to_numpy()
     out = (
-        s.astype(str)
-         .str.lower()
-         .apply(unidecode)
-         .str.replace(r"[^a-z0-9\s\-\+]", " ", regex=True)
-         .str.replace(r"\s+", " ", regex=True)
-         .str.strip()
+        out.str.replace(_CLEAN_RE, " ", regex=True)
+           .str.replace(r"\s+", " ", regex=True)
+           .str.strip()
     )
     return out
 
@@ -28,26 +39,14 @@ def norm_one(x: str) -> str:
 
 def infer_super_cat(text: str) -> str | None:
     """Map Polish menu text to broad FC super-category."""
-    t = norm_one(text)
-    if re.search(r"\bpizza\b", t): return "Pizza"
-    if re.search(r"\bpinsa\b", t): return "Pizza"
-    if re.search(r"\bhot\s?-?\s?dog\b|\bhotdog\b|\bhd\b", t): return "Hot Dog"
-    if re.search(r"\bburger\b", t): return "Burger"
-    if re.search(r"\bwrap\b", t): return "Wrap"
-    if re.search(r"\bpanini\b|\bbagiet", t): return "Panini"
-    if re.search(r"\btost(y|)\b", t): return "Tosty"
-    if re.search(r"\bkanapk|\bsandw", t): return "Kanapki"
-    if re.search(r"\bzapiekank", t): return "Zapiekanka"
-    if re.search(r"\bsalatk|\bsalat|\bsalad", t): return "Sałatki"
-    if re.search(r"\bfrytki\b|\bchrupbox\b|\bbox\b|\bnugget|\bstrip|\bfilecik|\bfilet\b", t): return "Frytki/Box"
-    if re.search(r"\bkawa\b|\bespresso\b|\bamericano\b|\blatte\b|\bcappuccino\b|\bflat white\b", t): return "Kawa"
-    return None
+    m = INFER_RE.match(norm_one(text))
+    return _INFER_GROUPS[m.lastgroup] if m else None
 
-def hits_any(patterns, text) -> bool:
-    return any(re.search(p, text) for p in patterns)
+def hits_any(rx: re.Pattern, text) -> bool:
+    return bool(rx.search(text))
 
 def is_weight_or_pack(text: str) -> bool:
-    return bool(re.search(r"\b\d{2,4}\s?(g|kg|ml|l)\b", text) or re.search(r"\bx\s?\d+\b", text))
+    return bool(WEIGHT_RE.search(text))
 
 # ------------------ Rules (allow/deny) ------------------
 FC_CATEGORIES = {
@@ -123,12 +122,88 @@ NEG_FROZEN_PACK = [r"\bmroz", r"\bmrozona", r"\bmrozone", r"\bzamroz", r"\bglebo
 NEG_COFFEE = [r"\bnapoj( energetyczny|)\b", r"\benergy\b", r"\bmonster\b", r"\bred ?bull\b",
               r"\boshee\b", r"\b4move\b", r"\bpepsi\b", r"\bcoca\b", r"\bcola\b", r"\bfanta\b", r"\bsprite\b"]
 
-def first_hit_category(text: str, cat2pats: dict) -> str | None:
-    for cat, pats in cat2pats.items():
-        if hits_any(pats, text):
+# Super-category cues for infer_super_cat, in priority order (first hit wins)
+INFER = {
+    "Pizza":      [r"\bpizza\b", r"\bpinsa\b"],
+    "Hot Dog":    [r"\bhot\s?-?\s?dog\b", r"\bhotdog\b", r"\bhd\b"],
+    "Burger":     [r"\bburger\b"],
+    "Wrap":       [r"\bwrap\b"],
+    "Panini":     [r"\bpanini\b", r"\bbagiet"],
+    "Tosty":      [r"\btost(y|)\b"],
+    "Kanapki":    [r"\bkanapk", r"\bsandw"],
+    "Zapiekanka": [r"\bzapiekank"],
+    "Sałatki":    [r"\bsalatk", r"\bsalat", r"\bsalad"],
+    "Frytki/Box": [r"\bfrytki\b", r"\bchrupbox\b", r"\bbox\b", r"\bnugget", r"\bstrip", r"\bfilecik", r"\bfilet\b"],
+    "Kawa":       [r"\bkawa\b", r"\bespresso\b", r"\bamericano\b", r"\blatte\b", r"\bcappuccino\b", r"\bflat white\b"],
+}
+
+# ------------------ Compiled patterns ------------------
+# Each list is collapsed into one alternation so a lookup is a single scan.
+
+def _union(pats: list[str]) -> re.Pattern:
+    return re.compile("|".join(pats))
+
+POS_RE = {cat: _union(pats) for cat, pats in POS.items()}
+LINES_ALLOW_RE = {cat: _union(pats) for cat, pats in LINES_ALLOW.items()}
+LINES_DENY_RE = _union(LINES_DENY)
+NEG_FROZEN_RE = _union(NEG_FROZEN_PACK)
+NEG_COFFEE_RE = _union(NEG_COFFEE)
+WEIGHT_RE = re.compile(r"\b\d{2,4}\s?(?:g|kg|ml|l)\b|\bx\s?\d+\b")
+
+def _ordered_union(branches: list[tuple[str, str]]) -> re.Pattern:
+    """
+    One lookahead branch per (name, pattern), tried in order from the start of
+    the text, so `.match(t).lastgroup` is the first branch that hits anywhere.
+    """
+    return re.compile("|".join(f"(?=.*?(?P<{name}>{pat}))" for name, pat in branches))
+
+_INFER_GROUPS = {re.sub(r"\W", "", cat): cat for cat in INFER}
+INFER_RE = _ordered_union([(name, "|".join(INFER[cat])) for name, cat in _INFER_GROUPS.items()])
+
+def first_hit_category(text: str, cat2re: dict) -> str | None:
+    for cat, rx in cat2re.items():
+        if hits_any(rx, text):
             return cat
     return None
 
+# ------------------ Canonical menu ------------------
+
+_CANONICAL_CACHE_VERSION = 3  # bump when the canonical preprocessing changes
+_CANONICAL_REQUIRED = {"menu_item", "menu_category"}
+
+def load_canonical(path: str | Path, cache_dir: str | Path | None = None) -> pd.DataFrame:
+    """
+    Read the canonical FC menu CSV with `menu_item_norm` precomputed,
+    ready for `map_fc_products`. Loads are memoized in-process by (path, mtime);
+    with `cache_dir` the normalized menu is also kept there as parquet, keyed by
+    the CSV content hash, so later runs skip the normalization.
+    """
+    path = Path(path).resolve()
+    cache_dir = str(Path(cache_dir).resolve()) if cache_dir is not None else None
+    return _load_canonical(str(path), path.stat().st_mtime_ns, cache_dir).copy()
+
+@lru_cache(maxsize=8)
+def _load_canonical(path: str, mtime_ns: int, cache_dir: str | None) -> pd.DataFrame:
+    raw = Path(path).read_bytes()
+    cached = None
+    if cache_dir is not None:
+        h = hashlib.blake2b(raw, digest_size=8)
+        h.update(str(_CANONICAL_CACHE_VERSION).encode())
+        cached = Path(cache_dir) / f"canonical_{h.hexdigest()}.parquet"
+        if cached.exists():
+            return pd.read_parquet(cached)
+
+    can = pd.read_csv(io.BytesIO(raw))
+    if not _CANONICAL_REQUIRED.issubset(can.columns):
+        raise ValueError(f"Canonical must contain {sorted(_CANONICAL_REQUIRED)}")
+    can["menu_item_norm"] = normalize_text(can["menu_item"])
+    if cached is not None:
+        try:
+            write_parquet(can, cached)
+        except OSError:
+            pass  # cache is best-effort (e.g. read-only dir)
+    return can
+
 # ------------------ Main API ------------------
 
 def map_fc_products(
@@ -157,7 +232,7 @@ def map_fc_products(
 
     POS_PATTERNS = [
         r"\bhot[\s\-]?dog\b",
-        r"\btost(y)?\b|\btoast\b",
+        r"\btost(?:y)?\b|\btoast\b",
         r"\bpanini\b",
         r"\bfrytk\w*\b",
         r"\bnugget\w*\b",
@@ -166,30 +241,28 @@ def map_fc_products(
         r"\bkurczaker\b",
     ]
     NEG_PATTERNS = [
-        r"\bmro(ż|z)on\w*",                # frozen
+        r"\bmro(?:ż|z)on\w*",              # frozen
         r"\bplastry\b",                    # sliced cold cuts
         r"\bfilet\b.*\b\d{2,3}\s?g\b",     # fixed-weight packaged meats
         r"\blisner\b|\bduda\b",            # packaged meat/salad brands
         r"\bpedigree\b|\breno\b",          # pet food
         r"\bduplo\b|\bsnickers\b",         # candy anchors
-        r"\bpies\b|\bps(ów|ow)\b|\bkot\b", # animal terms
+        r"\bpies\b|\bps(?:ów|ow)\b|\bkot\b", # animal terms
         r"\bkajzerka\b",                   # bread roll
     ]
 
-    POS_RE = re.compile("|".join(POS_PATTERNS), re.IGNORECASE)
-    NEG_RE = re.compile("|".join(NEG_PATTERNS), re.IGNORECASE)
-
-    def rule_is_fc(product_line_norm: str) -> bool:
-        if not isinstance(product_line_norm, str):
-            return False
-        return bool(POS_RE.search(product_line_norm)) and not bool(NEG_RE.search(product_line_norm))
+    # "any POS and no NEG" fused into one anchored pattern: a single scan per line
+    RULE_FC_RE = re.compile(
+        r"^(?!.*?(?:" + "|".join(NEG_PATTERNS) + r"))(?=.*?(?:" + "|".join(POS_PATTERNS) + r"))",
+        re.IGNORECASE | re.DOTALL,
+    )
 
     # --------- canonical prep ----------
     can = canonical_df.copy()
-    req_cols = {"menu_item", "menu_category"}
-    if not req_cols.issubset(can.columns):
-        raise ValueError(f"Canonical must contain {sorted(req_cols)}")
-    can["menu_item_norm"] = normalize_text(can["menu_item"])
+    if not _CANONICAL_REQUIRED.issubset(can.columns):
+        raise ValueError(f"Canonical must contain {sorted(_CANONICAL_REQUIRED)}")
+    if "menu_item_norm" not in can.columns:  # already there via load_canonical
+        can["menu_item_norm"] = normalize_text(can["menu_item"])
     # use a tiny list to speed up rapidfuzz calls
     can_items = can["menu_item_norm"].tolist()
 
@@ -211,64 +284,64 @@ def map_fc_products(
     else:
         # fallback: try to take a representative normalized product_line if present
         if "product_line" in invoice_df.columns:
+            # most frequent line per key: one groupby + one stable sort
             pl = (
                 invoice_df[[key_col, "product_line"]]
                 .dropna()
-                .assign(product_line=lambda d: d["product_line"].apply(normalize_text))
-                .groupby(key_col, as_index=False)["product_line"]
-                .agg(lambda s: s.value_counts().index[0])
+                .assign(product_line=lambda d: normalize_text(d["product_line"]))
+                .groupby([key_col, "product_line"], sort=False)
+                .size()
+                .reset_index(name="n")
+                .sort_values("n", ascending=False, kind="stable")
+                .drop_duplicates(key_col, keep="first")
+                .drop(columns="n")
                 .rename(columns={key_col: "product_key_raw"})
             )
             items = items.merge(pl, on="product_key_raw", how="left")
         else:
             items["product_line"] = pd.NA
 
-    # --------- per-item mapping ----------
-    out = []
-    for _, r in items.iterrows():
-        raw = r["product_key_raw"]
-        nm  = r["product_norm"]
-        pln = r.get("product_line")
-        pln = pln if isinstance(pln, str) else ""
-
-        # deterministic rule on product_line
-        rule_fc = rule_is_fc(pln)
-
-        # fuzzy to all canonical items
-        best_item = None
-        match_cat = None
-        score = 0
-        if len(can_items) > 0:
-            match = process.extractOne(nm, can_items, scorer=fuzz.token_set_ratio)
-            if match:
-                score = int(match[1]) if match[1] is not None else 0
-                idx = int(match[2]) if match[2] is not None else -1
-                if 0 <= idx < len(can):
-                    best_item = can.iloc[idx]["menu_item"]
-                    match_cat = can.iloc[idx]["menu_category"]
-
-        # category-aware / threshold decision
-        cat_fc = (match_cat in FC_CATEGORIES) and (score >= 60)
-        is_fc  = bool(rule_fc or cat_fc or (score >= threshold))
-
-        if nm.startswith("kajzerka ") or nm == "kajzerka":
-            is_fc = False
-
-        out.append({
-            "product_key_raw": raw,
-            "product_norm": nm,
-            "product_line": pln,
-            "best_match_item": best_item,
-            "match_category": match_cat,
-            "score": score,
-            "is_food_corner_auto": is_fc,
-        })
-
-
-    out_df = pd.DataFrame(out)[
-        ["product_key_raw","product_norm","product_line",
-         "best_match_item","match_category","score","is_food_corner_auto"]
-    ]
+    # --------- fuzzy to all canonical items (one batched call) ----------
+    # scores below the lowest bar used by the decision (60 / threshold) can't
+    # change it, so rapidfuzz may skip them early; those items get no match
+    cutoff = min(60, threshold)
+    queries = items["product_norm"].tolist()
+    score = np.zeros(len(queries), dtype=int)
+    best_item = np.full(len(queries), None, dtype=object)
+    match_cat = np.full(len(queries), None, dtype=object)
+    if len(can_items) > 0 and len(queries) > 0:
+        # full score matrix in one call; float64 keeps int() truncation identical to extractOne
+        scores = process.cdist(queries, can_items, scorer=fuzz.token_set_ratio,
+                               dtype=np.float64, workers=-1, score_cutoff=cutoff)
+        best_idx = scores.argmax(axis=1)
+        best = scores[np.arange(len(queries)), best_idx]
+        hit = best >= cutoff
+        score[hit] = best[hit].astype(int)
+        best_item[hit] = can["menu_item"].to_numpy()[best_idx[hit]]
+        match_cat[hit] = can["menu_category"].to_numpy()[best_idx[hit]]
+
+    # --------- vectorized FC decision ----------
+    out_df = pd.DataFrame({
+        "product_key_raw": items["product_key_raw"].to_numpy(),
+        "product_norm": items["product_norm"].to_numpy(),
+        "product_line": items["product_line"].fillna("").astype(str).to_numpy(),
+        "best_match_item": best_item,
+        "match_category": match_cat,
+        "score": score,
+    })
+    nm  = out_df["product_norm"]
+    pln = out_df["product_line"]
+
+    # deterministic rule on product_line
+    rule_fc = pln.str.match(RULE_FC_RE)
+
+    # category-aware / threshold decision
+    cat_fc = out_df["match_category"].isin(FC_CATEGORIES) & (out_df["score"] >= 60)
+    is_fc  = rule_fc | cat_fc | (out_df["score"] >= threshold)
+
+    is_kajzerka = nm.str.startswith("kajzerka ") | (nm == "kajzerka")
+    out_df["is_food_corner_auto"] = is_fc & ~is_kajzerka
+
     out_df.rename(columns={"product_key_raw": "product_raw"}, inplace=True)
     return out_df
 
@@ -1,5 +1,7 @@
 from pathlib import Path
 import pandas as pd
+from pandas.io.parsers import TextFileReader
+from src.clean_utils import ALIASES
 
 def ensure_dir(p: str | Path) -> Path:
     p = Path(p); p.mkdir(parents=True, exist_ok=True); return p
@@ -8,8 +10,30 @@ def list_csvs(folder: str | Path) -> list[Path]:
     folder = Path(folder)
     return sorted([p for p in folder.glob("*.csv")])
 
-def read_csv(path: str | Path, encoding: str | None = "utf-8") -> pd.DataFrame:
-    return pd.read_csv(path, encoding=encoding)
+def _date_columns(path: str | Path, encoding: str | None) -> list[str]:
+    """Header names that normalize_columns maps to purchase_date."""
+    header = pd.read_csv(path, nrows=0, encoding=encoding).columns
+    return [c for c in header if ALIASES.get(c.strip().lower()) == "purchase_date"]
+
+def read_csv(
+    path: str | Path,
+    encoding: str | None = "utf-8",
+    dtype: dict | None = None,
+    chunksize: int | None = None,
+) -> pd.DataFrame | TextFileReader:
+    """
+    Read a CSV with the multi-threaded pyarrow reader into Arrow-backed columns.
+    `dtype` pins column types (e.g. {"ean": "string[pyarrow]"}). Passing
+    `chunksize` returns a TextFileReader over Arrow-backed frames instead; the
+    pyarrow engine can't chunk, so that path uses the C engine.
+    Purchase-date columns are always read as strings so both paths hand
+    parse_timestamp the same input.
+    """
+    dtype = {**{c: "string[pyarrow]" for c in _date_columns(path, encoding)}, **(dtype or {})}
+    if chunksize is not None:
+        return pd.read_csv(path, encoding=encoding, dtype=dtype, chunksize=chunksize,
+                           dtype_backend="pyarrow")
+    return pd.read_csv(path, engine="pyarrow", dtype_backend="pyarrow", encoding=encoding, dtype=dtype)
 
 def write_parquet(df: pd.DataFrame, path: str | Path) -> None:
     Path(path).parent.mkdir(parents=True, exist_ok=True)
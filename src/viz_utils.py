@@ -1,38 +1,178 @@
+import io
+import os
+from functools import lru_cache
 from pathlib import Path
-import matplotlib.pyplot as plt
+import matplotlib
+import matplotlib.style
 import pandas as pd
 import matplotlib.ticker as mtick
-import textwrap
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from src.clean_utils import is_non_product, clean_non_products
 import numpy as np
 
+# Optional, faster PNG encoder for the image-heavy charts. Only the
+# pyspng-seunglab distribution can encode; the NVlabs "pyspng" on PyPI is
+# decode-only, so it is treated as absent.
+try:
+    import pyspng
+except ImportError:
+    pyspng = None
+if not hasattr(pyspng, "encode"):
+    pyspng = None
+
+# Charts are styled from matplotlib defaults; applied once here rather than
+# on every plot call (re-apply if a caller switches styles mid-run).
+matplotlib.style.use("default")
+
+# Output resolution for every chart; screen-quality by default, pass dpi=200
+# (or set VIZ_DPI) for print.
+DEFAULT_DPI = int(os.environ.get("VIZ_DPI", 100))
+
+# ---------- Shared figures ----------
+# Agg-only figures (Figure + FigureCanvasAgg, no pyplot state machine), keyed
+# by (figsize, facecolor) and reused across calls instead of building and
+# tearing down a Figure per saved chart. They are never closed; the next call
+# resets them.
+_FIG_CACHE = {}
+
+def _get_cached_fig(figsize=None, bg="white"):
+    """Return the shared (fig, ax) for `figsize`/`bg` with a brand-new Axes."""
+    key = (tuple(figsize or matplotlib.rcParams["figure.figsize"]), bg)
+    fig = _FIG_CACHE.get(key)
+    if fig is None:
+        fig = _FIG_CACHE[key] = Figure(figsize=key[0], layout="constrained")
+        FigureCanvasAgg(fig)
+    # keep the Figure/canvas but rebuild the Axes: clearing one in place leaves
+    # tick_params, grid kwargs, spines and colorbar slots from the last chart
+    fig.clear()
+    ax = fig.add_subplot()
+    fig.set_facecolor(bg)
+    ax.set_facecolor(bg)
+    return fig, ax
+
+def _savefig(fig, path, dpi, facecolor="auto"):
+    """Save as PNG with fast deflate (level 1, no optimize pass); files get a bit bigger."""
+    fig.savefig(path, dpi=dpi, facecolor=facecolor,
+                pil_kwargs={"compress_level": 1, "optimize": False})
+
+def _fast_png_save(fig, path, dpi, facecolor="auto"):
+    """Render to an RGBA buffer and encode it with pyspng (pyspng-seunglab); falls back to _savefig."""
+    if pyspng is None:
+        return _savefig(fig, path, dpi, facecolor)
+    if facecolor != "auto":
+        fig.set_facecolor(facecolor)
+    orig_dpi = fig.dpi
+    fig.set_dpi(dpi)  # same as savefig(dpi=...): render at the output resolution
+    try:
+        fig.canvas.draw()
+        buf = np.asarray(fig.canvas.buffer_rgba())
+        Path(path).write_bytes(pyspng.encode(buf, compress_level=1))
+    finally:
+        fig.set_dpi(orig_dpi)
+
+# ---------- Themes ----------
+# bar charts: (bar colour, background, text)
+_THEMES_BAR = {
+    "zabka":    ("#39A935", "white", "#333333"),
+    "business": ("#1F77B4", "white", "#333333"),
+    "dark":     ("#4CAF50", "#111111", "#FAFAFA"),
+}
+
+# plot_basket_fc_by_slot_thematic
+_THEMES_SLOT = {
+    "zabka": {
+        "bg": "white",
+        "axes_bg": "white",
+        "bar": "#39A935",          # Żabka green-ish
+        "edge": "white",
+        "grid": "#CCCCCC",
+        "title": "#222222",
+        "label": "#333333",
+    },
+    "business": {
+        "bg": "white",
+        "axes_bg": "white",
+        "bar": "#1F77B4",          # classic business blue
+        "edge": "white",
+        "grid": "#D0D0D0",
+        "title": "#111111",
+        "label": "#333333",
+    },
+    "dark": {
+        "bg": "#111111",
+        "axes_bg": "#111111",
+        "bar": "#4CAF50",          # bright green on dark
+        "edge": "#222222",
+        "grid": "#444444",
+        "title": "#FAFAFA",
+        "label": "#E0E0E0",
+    },
+}
+
+# heatmap: (background, colormap, text)
+_THEMES_HEATMAP = {
+    "zabka":    ("white", "Greens",  "#333333"),
+    "business": ("white", "Blues",   "#333333"),
+    "dark":     ("#111111", "Greens", "#FAFAFA"),
+}
+
+# tilemap: (background, main colour, text)
+_THEMES_TILEMAP = {
+    "zabka":    ("white", "#39A935", "#333333"),
+    "business": ("white", "#1F77B4", "#333333"),
+    "dark":     ("#63817F", "#4CAF50", "#030303"),
+}
+_THEME_CMAP = {"zabka": "Greens", "business": "Blues", "dark": "Greens"}
+
+@lru_cache(maxsize=None)
+def _empty_png(dpi):
+    """PNG bytes of a small "No data" placeholder, rendered once per dpi."""
+    fig = Figure(figsize=(4, 1))
+    FigureCanvasAgg(fig)
+    fig.text(0.5, 0.5, "No data", ha="center", va="center")
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi)
+    return buf.getvalue()
+
+def _write_empty_png(path, dpi):
+    """Write the "No data" placeholder instead of rendering an empty chart."""
+    Path(path).write_bytes(_empty_png(dpi))
+
+def _add_colorbar(fig, ax, im, txt, label=None):
+    """Attach a colorbar for `im` beside `ax`, with ticks (and optional label) in `txt`."""
+    # child cax beside the axes: the parent isn't shrunk and re-laid out,
+    # and constrained layout still sees it through ax's tight bbox
+    cax = ax.inset_axes([1.02, 0, 0.04, 1])
+    cbar = fig.colorbar(im, cax=cax)
+    cbar.ax.yaxis.set_tick_params(color=txt)
+    for tick in cbar.ax.get_yticklabels():
+        tick.set_color(txt)
+    if label is not None:
+        cbar.ax.set_ylabel(label, rotation=-90, va="bottom", color=txt)
+    return cbar
+
 def shorten_labels(index, max_len=32):
-    """Shorten overly long labels for plotting."""
-    return [textwrap.shorten(str(x), width=max_len, placeholder="…") for x in index]
-
-def plot_top_copurchase_horizontal(series, title, outpath, theme="zabka", top_n=15, label_max_len=32):
-    # --- theme config ---
-    themes = {
-        "zabka":    ("#39A935", "white", "#333333"),
-        "business": ("#1F77B4", "white", "#333333"),
-        "dark":     ("#4CAF50", "#111111", "#FAFAFA"),
-    }
-    bar_color, bg, txt = themes.get(theme, themes["zabka"])
+    """Shorten overly long labels for plotting (cut to `max_len` chars, ending in "…")."""
+    s = pd.Index(index).astype(str)
+    return s.where(s.str.len() <= max_len, s.str.slice(0, max_len - 1) + "…").tolist()
+
+def plot_top_copurchase_horizontal(series, title, outpath, theme="zabka", top_n=15, label_max_len=32, dpi=DEFAULT_DPI):
+    bar_color, bg, txt = _THEMES_BAR.get(theme, _THEMES_BAR["zabka"])
 
     # clean & reduce
     series = clean_non_products(series)
-    series = series.sort_values(ascending=False).head(top_n)
+    series = series.nlargest(top_n)
+    if series.empty:
+        return _write_empty_png(outpath, dpi)
 
-    plt.style.use("default")
-    fig, ax = plt.subplots(figsize=(12, 7))
-    fig.patch.set_facecolor(bg)
-    ax.set_facecolor(bg)
+    fig, ax = _get_cached_fig((12, 7), bg)
 
     # sort ascending for horizontal bars (small at top, big at bottom)
     s = series.sort_values()
     y_labels = shorten_labels(s.index, max_len=label_max_len)
 
-    ax.barh(y_labels, s.values, color=bar_color, edgecolor="white", linewidth=1.0)
+    bars = ax.barh(y_labels, s.values, color=bar_color, edgecolor="white", linewidth=1.0)
 
     ax.set_title(title, fontsize=18, color=txt, pad=18)
     ax.set_xlabel("Co-purchase quantity (line count)", fontsize=14, color=txt)
@@ -40,29 +180,19 @@ def plot_top_copurchase_horizontal(series, title, outpath, theme="zabka", top_n=
     ax.tick_params(axis="x", labelcolor=txt)
 
     # value labels on bars
-    max_val = s.values.max() if len(s) else 0
-    for i, v in enumerate(s.values):
-        ax.text(
-            v + max_val * 0.01,
-            i,
-            str(int(v)),
-            va="center",
-            fontsize=11,
-            color=txt,
-        )
+    labels = s.values.astype(np.int64).astype(str).tolist()
+    ax.bar_label(bars, labels=labels, padding=5, fontsize=11, color=txt)
 
     ax.grid(axis="x", linestyle="--", alpha=0.3, color=txt)
     ax.spines["top"].set_visible(False)
     ax.spines["right"].set_visible(False)
 
-    plt.tight_layout()
-    plt.savefig(outpath, dpi=200, facecolor=bg)
-    plt.close(fig)
+    _savefig(fig, outpath, dpi, bg)
 
-def save_bar(series: pd.Series, title: str, outpath: str):
+def save_bar(series: pd.Series, title: str, outpath: str, dpi: int = DEFAULT_DPI):
     Path(outpath).parent.mkdir(parents=True, exist_ok=True)
     s = series.dropna()
-    fig, ax = plt.subplots(figsize=(10, 5))
+    fig, ax = _get_cached_fig((10, 5))
     if s.empty:
         ax.text(0.5, 0.5, "No data", ha="center", va="center")
         ax.set_axis_off()
@@ -71,32 +201,31 @@ def save_bar(series: pd.Series, title: str, outpath: str):
         ax.set_title(title)
         ax.set_ylabel("")
         ax.tick_params(axis="x", rotation=45)
-    plt.tight_layout()
-    fig.savefig(outpath, dpi=150)
-    plt.close(fig)
+    _savefig(fig, outpath, dpi)
+
+def _float_values(series: pd.Series) -> np.ndarray:
+    """Series as a float64 array with missing values dropped."""
+    arr = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return arr[~np.isnan(arr)]
 
-def save_hist(series: pd.Series, bins: int, title: str, outpath: str, log=False):
+def save_hist(series: pd.Series, bins: int, title: str, outpath: str, log=False, dpi: int = DEFAULT_DPI):
     Path(outpath).parent.mkdir(parents=True, exist_ok=True)
-    ax = series.plot(kind="hist", bins=bins, log=log)
+    fig, ax = _get_cached_fig()
+    ax.hist(_float_values(series), bins=bins, log=log)
+    ax.set_ylabel("Frequency")
     ax.set_title(title)
-    plt.tight_layout()
-    plt.savefig(outpath, dpi=150)
-    plt.close()
+    _savefig(fig, outpath, dpi)
 
-def save_box(series: pd.Series, title: str, outpath: str, log=False):
+def save_box(series: pd.Series, title: str, outpath: str, log=False, dpi: int = DEFAULT_DPI):
     Path(outpath).parent.mkdir(parents=True, exist_ok=True)
-    fig, ax = plt.subplots()
-    ax.boxplot(series.dropna(), vert=True, showfliers=True)
+    fig, ax = _get_cached_fig()
+    ax.boxplot(_float_values(series), vert=True, showfliers=True)
     ax.set_title(title)
     if log: ax.set_yscale("log")
-    plt.tight_layout()
-    plt.savefig(outpath, dpi=150)
-    plt.close()
+    _savefig(fig, outpath, dpi)
 
-def plot_basket_fc_by_slot(series, title, outpath):
-    plt.style.use("default")
-
-    fig, ax = plt.subplots(figsize=(12, 6))
+def plot_basket_fc_by_slot(series, title, outpath, dpi=DEFAULT_DPI):
+    fig, ax = _get_cached_fig((12, 6))
 
     bars = ax.bar(
         series.index,
@@ -123,71 +252,24 @@ def plot_basket_fc_by_slot(series, title, outpath):
     ax.spines["right"].set_visible(False)
 
     # X-tick style
-    plt.xticks(
-        rotation=22,
-        ha="right",
-        fontsize=12
-    )
+    for label in ax.get_xticklabels():
+        label.set(rotation=22, ha="right", fontsize=12)
 
-    # Annotate each bar with its value
-    for bar in bars:
-        height = bar.get_height()
-        ax.annotate(
-            f"{height:.1%}",
-            xy=(bar.get_x() + bar.get_width() / 2, height),
-            xytext=(0, 5),      # offset above bar
-            textcoords="offset points",
-            ha="center",
-            va="bottom",
-            fontsize=12
-        )
+    # Annotate each bar with its value (5pt above the bar)
+    labels = [f"{v:.1%}" for v in series.values.tolist()]
+    ax.bar_label(bars, labels=labels, padding=5, fontsize=12)
 
-    plt.tight_layout()
-    plt.savefig(outpath, dpi=200)
-    plt.close(fig)
+    _savefig(fig, outpath, dpi)
     
-def plot_basket_fc_by_slot_thematic(series, title, outpath, theme="dark"):
+def plot_basket_fc_by_slot_thematic(series, title, outpath, theme="dark", dpi=DEFAULT_DPI):
     """
     series: index = slot_label, values = share (0–1)
     theme: 'zabka', 'business', 'dark'
     """
-    # --- themes ---
-    themes = {
-        "zabka": {
-            "bg": "white",
-            "axes_bg": "white",
-            "bar": "#39A935",          # Żabka green-ish
-            "edge": "white",
-            "grid": "#CCCCCC",
-            "title": "#222222",
-            "label": "#333333",
-        },
-        "business": {
-            "bg": "white",
-            "axes_bg": "white",
-            "bar": "#1F77B4",          # classic business blue
-            "edge": "white",
-            "grid": "#D0D0D0",
-            "title": "#111111",
-            "label": "#333333",
-        },
-        "dark": {
-            "bg": "#111111",
-            "axes_bg": "#111111",
-            "bar": "#4CAF50",          # bright green on dark
-            "edge": "#222222",
-            "grid": "#444444",
-            "title": "#FAFAFA",
-            "label": "#E0E0E0",
-        },
-    }
-
-    cfg = themes.get(theme, themes["zabka"])
+    cfg = _THEMES_SLOT.get(theme, _THEMES_SLOT["zabka"])
 
     # --- figure ---
-    plt.style.use("default")
-    fig, ax = plt.subplots(figsize=(12, 6))
-    fig.patch.set_facecolor(cfg["bg"])
+    fig, ax = _get_cached_fig((12, 6), cfg["bg"])
     ax.set_facecolor(cfg["axes_bg"])
 
     series = series[series.index != "Probably outliers"]
@@ -223,46 +305,29 @@ def plot_basket_fc_by_slot_thematic(series, title, outpath, theme="dark"):
         ax.spines["bottom"].set_color(cfg["grid"])
 
     # x-ticks
-    plt.xticks(rotation=22, ha="right", fontsize=12)
+    for label in ax.get_xticklabels():
+        label.set(rotation=22, ha="right", fontsize=12)
 
     # annotate bars
-    for bar in bars:
-        height = bar.get_height()
-        ax.annotate(
-            f"{height:.1%}",
-            xy=(bar.get_x() + bar.get_width() / 2, height),
-            xytext=(0, 5),
-            textcoords="offset points",
-            ha="center",
-            va="bottom",
-            fontsize=12,
-            color=cfg["label"],
-        )
+    labels = [f"{v:.1%}" for v in series.values.tolist()]
+    ax.bar_label(bars, labels=labels, padding=5, fontsize=12, color=cfg["label"])
 
-    plt.tight_layout()
-    plt.savefig(outpath, dpi=200, facecolor=cfg["bg"])
-    plt.close(fig)
+    _savefig(fig, outpath, dpi, cfg["bg"])
     
 
-def plot_fc_heatmap_weekday_slot(fc_heat, outpath, theme="zabka"):
+def plot_fc_heatmap_weekday_slot(fc_heat, outpath, theme="zabka", show_colorbar=False, dpi=DEFAULT_DPI):
     """
     fc_heat: DataFrame, index=weekday, columns=slot_label, values = FC line counts
+    show_colorbar: cells are annotated with their counts, so the colorbar is opt-in
     """
-    # --- themes ---
-    themes = {
-        "zabka":    ("white", "Greens",  "#333333"),
-        "business": ("white", "Blues",   "#333333"),
-        "dark":     ("#111111", "Greens", "#FAFAFA"),
-    }
-    bg, cmap_name, txt = themes.get(theme, themes["zabka"])
-
-    data = fc_heat.values
+    bg, cmap_name, txt = _THEMES_HEATMAP.get(theme, _THEMES_HEATMAP["zabka"])
+
+    data = np.ascontiguousarray(fc_heat.to_numpy(dtype=np.float32, copy=False))
+    if not data.any():  # empty or all-zero
+        return _write_empty_png(outpath, dpi)
     rows, cols = data.shape
 
-    plt.style.use("default")
-    fig, ax = plt.subplots(figsize=(10, 6))
-    fig.patch.set_facecolor(bg)
-    ax.set_facecolor(bg)
+    fig, ax = _get_cached_fig((10, 6), bg)
 
     # Heatmap
     im = ax.imshow(data, aspect="auto", cmap=cmap_name)
@@ -279,49 +344,40 @@ def plot_fc_heatmap_weekday_slot(fc_heat, outpath, theme="zabka"):
     ax.set_title("Food Corner line count — weekday × time slot", fontsize=16, color=txt, pad=14)
 
     # Colorbar
-    cbar = fig.colorbar(im, ax=ax)
-    cbar.ax.yaxis.set_tick_params(color=txt)
-    for label in cbar.ax.get_yticklabels():
-        label.set_color(txt)
-    cbar.ax.set_ylabel("FC line count", rotation=-90, va="bottom", color=txt)
+    if show_colorbar:
+        _add_colorbar(fig, ax, im, txt, label="FC line count")
 
     # Optional: annotate cells with counts (only if not too huge)
+    # visit non-zero cells only; label strings and text colours computed up front
     max_val = data.max()
-    for i in range(rows):
-        for j in range(cols):
-            v = int(data[i, j])
-            if v == 0:
-                continue
-            ax.text(
-                j, i, str(v),
-                ha="center", va="center",
-                fontsize=9,
-                color="white" if data[i, j] > max_val * 0.5 else txt,
-            )
+    bright = data > max_val * 0.5  # dark cells get white text
+    data_int = data.astype(np.int64)
+    coords = np.argwhere(data_int != 0)
+    labels = data_int[coords[:, 0], coords[:, 1]].astype(str)
+    colors = np.where(bright[coords[:, 0], coords[:, 1]], "white", txt)
+    for (i, j), label, color in zip(coords.tolist(), labels.tolist(), colors.tolist()):
+        ax.text(
+            j, i, label,
+            ha="center", va="center",
+            fontsize=9,
+            color=color,
+        )
 
     # Clean grid / spines
     ax.spines["top"].set_visible(False)
     ax.spines["right"].set_visible(False)
 
-    plt.tight_layout()
-    plt.savefig(outpath, dpi=200, facecolor=bg)
-    plt.close(fig)
+    _fast_png_save(fig, outpath, dpi, bg)
     
-def plot_top_fc_anchors(series, outpath, theme="dark"):
-    themes = {
-        "zabka":    ("#39A935", "white", "#333333"),
-        "business": ("#1F77B4", "white", "#333333"),
-        "dark":     ("#4CAF50", "#111111", "#FAFAFA"),
-    }
-    bar_color, bg, txt = themes.get(theme, themes["zabka"])
-
-    plt.style.use("default")
-    fig, ax = plt.subplots(figsize=(10, 6))
-    fig.patch.set_facecolor(bg)
-    ax.set_facecolor(bg)
+def plot_top_fc_anchors(series, outpath, theme="dark", dpi=DEFAULT_DPI):
+    bar_color, bg, txt = _THEMES_BAR.get(theme, _THEMES_BAR["zabka"])
+    if series.empty:
+        return _write_empty_png(outpath, dpi)
+
+    fig, ax = _get_cached_fig((10, 6), bg)
 
     s = series.sort_values()  # smallest at top, biggest at bottom
-    ax.barh(s.index, s.values, color=bar_color, edgecolor="white", linewidth=1.0)
+    bars = ax.barh(s.index, s.values, color=bar_color, edgecolor="white", linewidth=1.0)
 
     ax.set_title("Top Food Corner items (by baskets with FC)", fontsize=18, color=txt, pad=16)
     ax.set_xlabel("Number of baskets", fontsize=14, color=txt)
@@ -329,44 +385,27 @@ def plot_top_fc_anchors(series, outpath, theme="dark"):
     ax.tick_params(axis="x", labelcolor=txt)
 
     # Labels on bars
-    for i, v in enumerate(s.values):
-        ax.text(
-            v + max(s.values)*0.01,
-            i,
-            str(v),
-            va="center",
-            fontsize=11,
-            color=txt,
-        )
+    labels = s.values.astype(str).tolist()
+    ax.bar_label(bars, labels=labels, padding=5, fontsize=11, color=txt)
 
     ax.grid(axis="x", linestyle="--", alpha=0.3, color=txt)
     ax.spines["top"].set_visible(False)
     ax.spines["right"].set_visible(False)
 
-    plt.tight_layout()
-    plt.savefig(outpath, dpi=200, facecolor=bg)
-    plt.close(fig)
-
-def plot_fc_copurchase_tilemap(mat, outpath, theme="dark"):
-    themes = {
-        "zabka":    ("white", "#39A935", "#333333"),
-        "business": ("white", "#1F77B4", "#333333"),
-        "dark":     ("#63817F", "#4CAF50", "#030303"),
-    }
-    bg, main, txt = themes.get(theme, themes["zabka"])
-
-    plt.style.use("default")
-    fig, ax = plt.subplots(figsize=(12, 6))
-    fig.patch.set_facecolor(bg)
-    ax.set_facecolor(bg)
+    _savefig(fig, outpath, dpi, bg)
+
+def plot_fc_copurchase_tilemap(mat, outpath, theme="dark", show_colorbar=False, dpi=DEFAULT_DPI):
+    bg, main, txt = _THEMES_TILEMAP.get(theme, _THEMES_TILEMAP["zabka"])
 
     # Convert to numpy
-    data = mat.values
+    data = np.ascontiguousarray(mat.to_numpy(dtype=np.float32, copy=False))
+    if not data.any():  # empty or all-zero
+        return _write_empty_png(outpath, dpi)
 
-    # Colour map: light→dark main color
-    cmap = plt.cm.get_cmap("Greens" if theme == "zabka" else
-                           "Blues"   if theme == "business" else
-                           "Greens").copy()
+    fig, ax = _get_cached_fig((12, 6), bg)
+
+    # Colour map: light→dark main color (registry lookup, never mutated here)
+    cmap = matplotlib.colormaps[_THEME_CMAP.get(theme, "Greens")]
     # Heatmap
     im = ax.imshow(data, aspect="auto", cmap=cmap)
 
@@ -380,24 +419,18 @@ def plot_fc_copurchase_tilemap(mat, outpath, theme="dark"):
     ax.set_ylabel("Food Corner anchor", fontsize=14, color=txt)
     ax.set_title("What do people buy with each top FC item?", fontsize=18, color=txt, pad=16)
 
-    # Colorbar
-    cbar = fig.colorbar(im, ax=ax)
-    cbar.ax.yaxis.set_tick_params(color=txt)
-    plt.setp(cbar.ax.get_yticklabels(), color=txt)
-
-    norm = im.norm  # normalization function used by the colormap
-    cmap_obj = im.cmap
-
-    for i in range(mat.shape[0]):
-        for j in range(mat.shape[1]):
-            val = data[i, j]
-            if val > 0:
-                ax.text(
-                    j, i, int(val),
-                    ha="center", va="center",
-                    fontsize=8, color=txt
-                )
-
-    plt.tight_layout()
-    plt.savefig(outpath, dpi=200, facecolor=bg)
-    plt.close(fig)
\ No newline at end of file
+    # Colorbar (opt-in; the cells already carry their counts)
+    if show_colorbar:
+        _add_colorbar(fig, ax, im, txt)
+
+    # only the (usually few) positive cells get a label
+    ii, jj = np.nonzero(data > 0)
+    labels = data[ii, jj].astype(np.int64).astype(str)
+    for i, j, label in zip(ii.tolist(), jj.tolist(), labels.tolist()):
+        ax.text(
+            j, i, label,
+            ha="center", va="center",
+            fontsize=8, color=txt
+        )
+
+    _fast_png_save(fig, outpath, dpi, bg)
\ No newline at end of file